@@ -1,264 +1,641 @@
 #!/usr/bin/env python3
 
-"""Lightweight bridge to the Lighter signer shared library using stdin/stdout JSON RPC."""
+"""Lightweight bridge to the Lighter signer shared library using stdin/stdout JSON RPC.
+
+Requests and responses are framed with a 4-byte little-endian length prefix by
+default. A response frame holds a JSON envelope; when the result is a signed
+payload it follows the envelope after a newline as raw UTF-8 rather than as an
+escaped ``result`` string. Set ``LIGHTER_SIGNER_FRAMING=line`` to fall back to
+newline-delimited JSON for older clients.
+
+When ``LIGHTER_SIGNER_SOCKET`` names a path, the bridge instead listens on that
+Unix domain socket and exchanges MessagePack maps with a single client; this
+mode requires the ``msgpack`` package.
+
+The signer library is called through cffi ABI mode when cffi is installed and
+through ctypes otherwise.
+"""
 
 import ctypes
 import json
 import os
 import platform
+import socket
+import stat
+import struct
 import subprocess
 import sys
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    from cffi import FFI
+except ImportError:  # pragma: no cover - optional speedup
+    FFI = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - only needed for socket mode
+    msgpack = None
+
+
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:  # pragma: no cover - stdlib fallback
+
+    def _loads(data: Any) -> Any:
+        return json.loads(bytes(data))
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 
 class StrOrErr(ctypes.Structure):
     _fields_ = [("str", ctypes.c_char_p), ("err", ctypes.c_char_p)]
 
 
+# Mirrors the cgo export header; only used when cffi is installed.
+_SIGNER_CDEF = """
+typedef struct { char* str; char* err; } StrOrErr;
+char* CreateClient(char* url, char* privateKey, int chainId, int apiKeyIndex, long long accountIndex);
+char* SwitchAPIKey(int apiKeyIndex);
+StrOrErr SignCreateOrder(int marketIndex, long long clientOrderIndex, long long baseAmount, int price, int isAsk,
+                         int orderType, int timeInForce, int reduceOnly, int triggerPrice, long long orderExpiry,
+                         long long nonce);
+StrOrErr SignCancelOrder(int marketIndex, long long orderIndex, long long nonce);
+StrOrErr SignCancelAllOrders(int timeInForce, long long time, long long nonce);
+StrOrErr CreateAuthToken(long long deadline);
+"""
+
+
+_UNAME = platform.uname()
+SYSTEM = _UNAME.system
+MACHINE = _UNAME.machine.lower()
+
+
 def _resolve_signer_path() -> str:
     base = os.path.abspath(os.path.dirname(__file__))
     signers_dir = os.path.join(base, "signers")
-    system = platform.system()
-    machine = platform.machine().lower()
 
-    if system == "Darwin":
-        path = os.path.join(signers_dir, "signer-arm64.dylib" if machine == "arm64" else "signer-amd64.dylib")
-    elif system == "Linux":
+    if SYSTEM == "Darwin":
+        path = os.path.join(signers_dir, "signer-arm64.dylib" if MACHINE == "arm64" else "signer-amd64.dylib")
+    elif SYSTEM == "Linux":
         path = os.path.join(signers_dir, "signer-amd64.so")
     else:
-        raise RuntimeError(f"Unsupported platform: {system} {machine}")
+        raise RuntimeError(f"Unsupported platform: {SYSTEM} {MACHINE}")
 
     if not os.path.exists(path):
         raise FileNotFoundError(f"Signer library missing: {path}")
     return path
 
 
-def _load_library(path: str) -> ctypes.CDLL:
+def _remove_quarantine(path: str) -> None:  # pragma: no cover - macOS only
+    # os.removexattr is Linux-only; call libSystem directly instead of forking /usr/bin/xattr.
+    # int removexattr(const char *path, const char *name, int options)
     try:
-        return ctypes.CDLL(path)
+        ctypes.CDLL(None).removexattr(os.fsencode(path), b"com.apple.quarantine", 0)
+    except (OSError, AttributeError):
+        pass
+
+
+def _load_library(path: str, opener: Callable[[str], Any]) -> Any:
+    try:
+        return opener(path)
     except OSError as exc:  # pragma: no cover - runtime environment guard
         message = str(exc)
-        if platform.system() == "Darwin" and "code signature" in message:
-            subprocess.run(["/usr/bin/xattr", "-d", "com.apple.quarantine", path], check=False, capture_output=True)
-            subprocess.run(["/usr/bin/codesign", "--force", "--sign", "-", path], check=False, capture_output=True)
-            return ctypes.CDLL(path)
+        if SYSTEM == "Darwin" and "code signature" in message:
+            _remove_quarantine(path)
+            try:
+                return opener(path)
+            except OSError:
+                subprocess.run(["/usr/bin/codesign", "--force", "--sign", "-", path], check=False, capture_output=True)
+                return opener(path)
         raise
 
 
 SIGNER_PATH = _resolve_signer_path()
 
 try:
-    LIB = _load_library(SIGNER_PATH)
+    if FFI is not None:
+        _ffi = FFI()
+        _ffi.cdef(_SIGNER_CDEF)
+        LIB = _load_library(SIGNER_PATH, _ffi.dlopen)
+    else:
+        _ffi = None
+        LIB = _load_library(SIGNER_PATH, ctypes.CDLL)
 except OSError as exc:  # pragma: no cover - runtime environment guard
-    print(json.dumps({"id": None, "error": f"failed_to_load_signer:{exc}"}), flush=True)
+    print(f"failed_to_load_signer:{exc}", file=sys.stderr, flush=True)
     sys.exit(1)
 
 
-LIB.CreateClient.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.c_longlong]
-LIB.CreateClient.restype = ctypes.c_char_p
-
-LIB.SwitchAPIKey.argtypes = [ctypes.c_int]
-LIB.SwitchAPIKey.restype = ctypes.c_char_p
-
-LIB.SignCreateOrder.argtypes = [
-    ctypes.c_int,
-    ctypes.c_longlong,
-    ctypes.c_longlong,
-    ctypes.c_int,
-    ctypes.c_int,
-    ctypes.c_int,
-    ctypes.c_int,
-    ctypes.c_int,
-    ctypes.c_int,
-    ctypes.c_longlong,
-    ctypes.c_longlong,
-]
-LIB.SignCreateOrder.restype = StrOrErr
-
-LIB.SignCancelOrder.argtypes = [ctypes.c_int, ctypes.c_longlong, ctypes.c_longlong]
-LIB.SignCancelOrder.restype = StrOrErr
-
-LIB.SignCancelAllOrders.argtypes = [ctypes.c_int, ctypes.c_longlong, ctypes.c_longlong]
-LIB.SignCancelAllOrders.restype = StrOrErr
-
-LIB.CreateAuthToken.argtypes = [ctypes.c_longlong]
-LIB.CreateAuthToken.restype = StrOrErr
-
-
-def _unwrap(result: StrOrErr) -> Dict[str, Any]:
-    if result.err:
-        return {"error": ctypes.string_at(result.err).decode("utf-8", errors="replace")}
-    if result.str:
-        return {"result": ctypes.string_at(result.str).decode("utf-8", errors="replace")}
-    return {"result": None}
-
-
-def _maybe_error(ptr: ctypes.c_char_p) -> Dict[str, Any]:
-    if ptr:
-        return {"error": ctypes.string_at(ptr).decode("utf-8", errors="replace")}
-    return {"result": "ok"}
-
+# cffi takes its signatures from the cdef; ctypes needs them declared per export.
+if _ffi is None:
+    LIB.CreateClient.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_int, ctypes.c_longlong]
+    LIB.CreateClient.restype = ctypes.c_char_p
+
+    LIB.SwitchAPIKey.argtypes = [ctypes.c_int]
+    LIB.SwitchAPIKey.restype = ctypes.c_char_p
+
+    LIB.SignCreateOrder.argtypes = [
+        ctypes.c_int,
+        ctypes.c_longlong,
+        ctypes.c_longlong,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.c_longlong,
+        ctypes.c_longlong,
+    ]
+    LIB.SignCreateOrder.restype = StrOrErr
+
+    LIB.SignCancelOrder.argtypes = [ctypes.c_int, ctypes.c_longlong, ctypes.c_longlong]
+    LIB.SignCancelOrder.restype = StrOrErr
+
+    LIB.SignCancelAllOrders.argtypes = [ctypes.c_int, ctypes.c_longlong, ctypes.c_longlong]
+    LIB.SignCancelAllOrders.restype = StrOrErr
+
+    LIB.CreateAuthToken.argtypes = [ctypes.c_longlong]
+    LIB.CreateAuthToken.restype = StrOrErr
+
+
+# Every export is bound once so its symbol is resolved at import and handlers skip LIB's
+# attribute lookup. Both backends coerce plain ints, so arguments are passed straight through.
+# They also drop the GIL for the length of every foreign call (CDLL, unlike PyDLL, and cffi
+# both do), so a C shim would not buy concurrency. What keeps signing serial is the Go side:
+# SwitchAPIKey selects a process-wide key, so a switch and the sign that follows must not
+# interleave with another key's requests.
+_create_client = LIB.CreateClient
+_switch_api_key = LIB.SwitchAPIKey
+_sign_create_order = LIB.SignCreateOrder
+_sign_cancel_order = LIB.SignCancelOrder
+_sign_cancel_all_orders = LIB.SignCancelAllOrders
+_create_auth_token = LIB.CreateAuthToken
+
+
+# Handlers return (status, payload): status is None on success, or _ERR with the error message
+# as payload. Signer errors, uninitialised clients and missing fields are reported this way
+# without raising; only non-integer field values still reach the dispatch safety net.
+_ERR = object()
+Outcome = Tuple[Optional[object], Any]
+
+if _ffi is not None:
+    _ffi_string = _ffi.string
+
+    def _unwrap(result: Any) -> Outcome:
+        if result.err:
+            return _ERR, _ffi_string(result.err).decode("utf-8", errors="replace")
+        if result.str:
+            return None, _ffi_string(result.str)
+        return None, None
+
+    def _error_message(ptr: Any) -> Optional[str]:
+        if ptr:
+            return _ffi_string(ptr).decode("utf-8", errors="replace")
+        return None
+
+else:
+    # c_char_p fields and restypes already come back as bytes (or None), so no string_at copy.
+
+    def _unwrap(result: Any) -> Outcome:
+        err = result.err
+        if err:
+            return _ERR, err.decode("utf-8", errors="replace")
+        return None, result.str or None
+
+    def _error_message(ptr: Optional[bytes]) -> Optional[str]:
+        if ptr:
+            return ptr.decode("utf-8", errors="replace")
+        return None
+
+
+# Shared success marker; JSON writers recognise it by identity and emit a pre-built response.
+_OK = "ok"
 
 _INITIALISED_KEYS = set()
 _CLIENT_CONFIG: Dict[int, Dict[str, Any]] = {}
+# Key the signer currently signs with, or None when unknown (e.g. after CreateClient).
+_ACTIVE_KEY: Optional[int] = None
+_CLIENT_CONFIG_PARAMS = frozenset(("baseUrl", "privateKey", "chainId", "accountIndex"))
+
+
+def _missing_params(required: frozenset, params: Dict[str, Any]) -> str:
+    # Only built on the error path, so complete requests pay for the subset check alone.
+    return f"missing_params:{','.join(sorted(required - params.keys()))}"
 
 
-def _ensure_client(params: Dict[str, Any]) -> Dict[str, Any]:
+def _ensure_client(params: Dict[str, Any]) -> Optional[str]:
+    global _ACTIVE_KEY
     api_key_index = int(params["apiKeyIndex"])
 
     config = _CLIENT_CONFIG.get(api_key_index)
     if "baseUrl" in params and "privateKey" in params:
+        if not params.keys() >= _CLIENT_CONFIG_PARAMS:
+            return _missing_params(_CLIENT_CONFIG_PARAMS, params)
+        # Stored pre-encoded so re-initialising a key does not redo the conversions.
         config = {
-            "baseUrl": params["baseUrl"],
-            "privateKey": params["privateKey"],
+            "baseUrl": params["baseUrl"].encode("utf-8"),
+            "privateKey": params["privateKey"].encode("utf-8"),
             "chainId": int(params["chainId"]),
             "accountIndex": int(params["accountIndex"]),
         }
         _CLIENT_CONFIG[api_key_index] = config
 
     if config is None:
-        return {"error": "client_not_initialized"}
+        return "client_not_initialized"
 
     if api_key_index in _INITIALISED_KEYS:
-        return {"result": "ok"}
-
-    err_ptr = LIB.CreateClient(
-        config["baseUrl"].encode("utf-8"),
-        config["privateKey"].encode("utf-8"),
-        ctypes.c_int(int(config["chainId"])),
-        ctypes.c_int(api_key_index),
-        ctypes.c_longlong(int(config["accountIndex"])),
+        return None
+
+    err_ptr = _create_client(
+        config["baseUrl"],
+        config["privateKey"],
+        config["chainId"],
+        api_key_index,
+        config["accountIndex"],
     )
-    outcome = _maybe_error(err_ptr)
-    if "error" in outcome:
-        return outcome
+    _ACTIVE_KEY = None
+    error = _error_message(err_ptr)
+    if error is None:
+        _INITIALISED_KEYS.add(api_key_index)
+    return error
 
-    _INITIALISED_KEYS.add(api_key_index)
-    return {"result": "ok"}
 
+def _activate_key(api_key_index: int) -> Optional[str]:
+    global _ACTIVE_KEY
+    if api_key_index == _ACTIVE_KEY:
+        return None
+    error = _error_message(_switch_api_key(api_key_index))
+    if error is None:
+        _ACTIVE_KEY = api_key_index
+    return error
 
-def _switch_api_key(api_key_index: int) -> Dict[str, Any]:
-    err_ptr = LIB.SwitchAPIKey(ctypes.c_int(api_key_index))
-    return _maybe_error(err_ptr)
 
+def _prepare_key(params: Dict[str, Any]) -> Optional[str]:
+    error = _ensure_client(params)
+    if error is not None:
+        return error
+    return _activate_key(int(params["apiKeyIndex"]))
 
-def handle_create_client(params: Dict[str, Any]) -> Dict[str, Any]:
-    return _ensure_client(params)
 
+# Argument order of each signer export; every field is an integer in the request params.
+_CREATE_ORDER_KEYS = (
+    "marketIndex",
+    "clientOrderIndex",
+    "baseAmount",
+    "price",
+    "isAsk",
+    "orderType",
+    "timeInForce",
+    "reduceOnly",
+    "triggerPrice",
+    "orderExpiry",
+    "nonce",
+)
+_CANCEL_ORDER_KEYS = ("marketIndex", "orderIndex", "nonce")
+_CANCEL_ALL_KEYS = ("timeInForce", "scheduledTime", "nonce")
 
-def handle_sign_create_order(params: Dict[str, Any]) -> Dict[str, Any]:
-    ensure = _ensure_client(params)
-    if "error" in ensure:
-        return ensure
+# Fields each signing method needs, checked up front so incomplete requests fail without raising.
+_CREATE_ORDER_PARAMS = frozenset(("apiKeyIndex",) + _CREATE_ORDER_KEYS)
+_CANCEL_ORDER_PARAMS = frozenset(("apiKeyIndex",) + _CANCEL_ORDER_KEYS)
+_CANCEL_ALL_PARAMS = frozenset(("apiKeyIndex",) + _CANCEL_ALL_KEYS)
+_AUTH_TOKEN_PARAMS = frozenset(("apiKeyIndex", "deadlineMs"))
+_CLIENT_KEY_PARAMS = frozenset(("apiKeyIndex",))
+_BATCH_PARAMS = frozenset(("requests",))
 
-    api_key_index = int(params["apiKeyIndex"])
-    switched = _switch_api_key(api_key_index)
-    if "error" in switched:
-        return switched
-
-    expiry = int(params["orderExpiry"])
-    result = LIB.SignCreateOrder(
-        ctypes.c_int(int(params["marketIndex"])),
-        ctypes.c_longlong(int(params["clientOrderIndex"])),
-        ctypes.c_longlong(int(params["baseAmount"])),
-        ctypes.c_int(int(params["price"])),
-        ctypes.c_int(int(params["isAsk"])),
-        ctypes.c_int(int(params["orderType"])),
-        ctypes.c_int(int(params["timeInForce"])),
-        ctypes.c_int(int(params["reduceOnly"])),
-        ctypes.c_int(int(params["triggerPrice"])),
-        ctypes.c_longlong(expiry),
-        ctypes.c_longlong(int(params["nonce"])),
-    )
-    return _unwrap(result)
 
+def _sign_create_order_tx(params: Dict[str, Any]) -> Outcome:
+    return _unwrap(_sign_create_order(*map(int, map(params.__getitem__, _CREATE_ORDER_KEYS))))
 
-def handle_sign_cancel_order(params: Dict[str, Any]) -> Dict[str, Any]:
-    ensure = _ensure_client(params)
-    if "error" in ensure:
-        return ensure
 
-    api_key_index = int(params["apiKeyIndex"])
-    switched = _switch_api_key(api_key_index)
-    if "error" in switched:
-        return switched
-
-    result = LIB.SignCancelOrder(
-        ctypes.c_int(int(params["marketIndex"])),
-        ctypes.c_longlong(int(params["orderIndex"])),
-        ctypes.c_longlong(int(params["nonce"])),
-    )
-    return _unwrap(result)
+def _sign_cancel_order_tx(params: Dict[str, Any]) -> Outcome:
+    return _unwrap(_sign_cancel_order(*map(int, map(params.__getitem__, _CANCEL_ORDER_KEYS))))
 
 
-def handle_sign_cancel_all(params: Dict[str, Any]) -> Dict[str, Any]:
-    ensure = _ensure_client(params)
-    if "error" in ensure:
-        return ensure
-
-    api_key_index = int(params["apiKeyIndex"])
-    switched = _switch_api_key(api_key_index)
-    if "error" in switched:
-        return switched
-
-    result = LIB.SignCancelAllOrders(
-        ctypes.c_int(int(params["timeInForce"])),
-        ctypes.c_longlong(int(params["scheduledTime"])),
-        ctypes.c_longlong(int(params["nonce"])),
-    )
-    return _unwrap(result)
+def _sign_cancel_all_tx(params: Dict[str, Any]) -> Outcome:
+    return _unwrap(_sign_cancel_all_orders(*map(int, map(params.__getitem__, _CANCEL_ALL_KEYS))))
 
 
-def handle_create_auth_token(params: Dict[str, Any]) -> Dict[str, Any]:
-    ensure = _ensure_client(params)
-    if "error" in ensure:
-        return ensure
-
-    api_key_index = int(params["apiKeyIndex"])
-    switched = _switch_api_key(api_key_index)
-    if "error" in switched:
-        return switched
+def _create_auth_token_tx(params: Dict[str, Any]) -> Outcome:
+    return _unwrap(_create_auth_token(int(params["deadlineMs"])))
 
-    result = LIB.CreateAuthToken(ctypes.c_longlong(int(params["deadlineMs"])))
-    return _unwrap(result)
 
-
-HANDLERS = {
-    "create_client": handle_create_client,
-    "sign_create_order": handle_sign_create_order,
-    "sign_cancel_order": handle_sign_cancel_order,
-    "sign_cancel_all": handle_sign_cancel_all,
-    "create_auth_token": handle_create_auth_token,
+_BATCH_SIGNERS: Dict[str, Tuple[frozenset, Callable[[Dict[str, Any]], Outcome]]] = {
+    "sign_create_order": (_CREATE_ORDER_PARAMS, _sign_create_order_tx),
+    "sign_cancel_order": (_CANCEL_ORDER_PARAMS, _sign_cancel_order_tx),
+    "sign_cancel_all": (_CANCEL_ALL_PARAMS, _sign_cancel_all_tx),
+    "create_auth_token": (_AUTH_TOKEN_PARAMS, _create_auth_token_tx),
 }
 
 
-def main() -> None:
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
+def handle_create_client(params: Dict[str, Any]) -> Outcome:
+    if not params.keys() >= _CLIENT_KEY_PARAMS:
+        return _ERR, _missing_params(_CLIENT_KEY_PARAMS, params)
+    error = _ensure_client(params)
+    if error is not None:
+        return _ERR, error
+    return None, _OK
+
+
+def handle_sign_create_order(params: Dict[str, Any]) -> Outcome:
+    if not params.keys() >= _CREATE_ORDER_PARAMS:
+        return _ERR, _missing_params(_CREATE_ORDER_PARAMS, params)
+    error = _prepare_key(params)
+    if error is not None:
+        return _ERR, error
+    return _sign_create_order_tx(params)
+
+
+def handle_sign_cancel_order(params: Dict[str, Any]) -> Outcome:
+    if not params.keys() >= _CANCEL_ORDER_PARAMS:
+        return _ERR, _missing_params(_CANCEL_ORDER_PARAMS, params)
+    error = _prepare_key(params)
+    if error is not None:
+        return _ERR, error
+    return _sign_cancel_order_tx(params)
+
+
+def handle_sign_cancel_all(params: Dict[str, Any]) -> Outcome:
+    if not params.keys() >= _CANCEL_ALL_PARAMS:
+        return _ERR, _missing_params(_CANCEL_ALL_PARAMS, params)
+    error = _prepare_key(params)
+    if error is not None:
+        return _ERR, error
+    return _sign_cancel_all_tx(params)
+
+
+def handle_create_auth_token(params: Dict[str, Any]) -> Outcome:
+    if not params.keys() >= _AUTH_TOKEN_PARAMS:
+        return _ERR, _missing_params(_AUTH_TOKEN_PARAMS, params)
+    error = _prepare_key(params)
+    if error is not None:
+        return _ERR, error
+    return _create_auth_token_tx(params)
+
+
+def handle_sign_batch(params: Dict[str, Any]) -> Outcome:
+    """Sign several requests in one round trip, e.g. a whole quote grid.
+
+    Each entry of ``params["requests"]`` is ``{"method": ..., "params": {...}}``. Results keep
+    the request order and carry either ``result`` or ``error``, so one bad entry does not fail
+    the rest of the batch.
+    """
+    if not params.keys() >= _BATCH_PARAMS:
+        return _ERR, _missing_params(_BATCH_PARAMS, params)
+    requests = params["requests"]
+    if type(requests) is not list:
+        return _ERR, "invalid_request"
+    results: List[Dict[str, Any]] = []
+    prepared_key: Optional[int] = None
+    for request in requests:
+        if type(request) is not dict:
+            results.append({"error": "invalid_request"})
+            continue
+        method = request.get("method")
+        entry = _BATCH_SIGNERS.get(method)
+        if entry is None:
+            results.append({"error": f"unknown_method:{method}"})
             continue
+        required, signer = entry
+        sub_params = request.get("params", {})
         try:
-            request = json.loads(line)
-        except json.JSONDecodeError as exc:  # pragma: no cover - defensive
-            print(json.dumps({"id": None, "error": f"invalid_json:{exc}"}), flush=True)
+            if not sub_params.keys() >= required:
+                results.append({"error": _missing_params(required, sub_params)})
+                continue
+            api_key_index = int(sub_params["apiKeyIndex"])
+            if api_key_index != prepared_key:
+                prepared_key = None
+                error = _prepare_key(sub_params)
+                if error is not None:
+                    results.append({"error": error})
+                    continue
+                prepared_key = api_key_index
+            status, value = signer(sub_params)
+        except Exception as exc:  # pragma: no cover - non-integer field or non-object params
+            results.append({"error": f"exception:{exc}"})
             continue
+        if status is _ERR:
+            results.append({"error": value})
+        else:
+            results.append({"result": value})
+    return None, results
 
-        req_id = request.get("id")
-        method = request.get("method")
-        params = request.get("params", {})
 
-        handler = HANDLERS.get(method)
-        if not handler:
-            response = {"id": req_id, "error": f"unknown_method:{method}"}
+FRAMING = os.environ.get("LIGHTER_SIGNER_FRAMING", "length")
+SOCKET_PATH = os.environ.get("LIGHTER_SIGNER_SOCKET")
+_FRAME_HEADER = struct.Struct("<I")
+
+# stdin/stdout are driven through the raw descriptors to bypass TextIOWrapper and its locking.
+STDIN_FD = 0
+STDOUT_FD = 1
+READ_CHUNK = 65536
+
+# Response templates are filled in place and serialized immediately, so one of each suffices.
+_RESPONSE: Dict[str, Any] = {"id": None, "result": None}
+_ERROR_RESPONSE: Dict[str, Any] = {"id": None, "error": None}
+_RAW_ENVELOPE: Dict[str, Any] = {"id": None}
+_OK_TEMPLATE = b'{"id":%s,"result":"ok"}'
+
+
+def _error_response(req_id: Any, message: str) -> Dict[str, Any]:
+    _ERROR_RESPONSE["id"] = req_id
+    _ERROR_RESPONSE["error"] = message
+    return _ERROR_RESPONSE
+
+
+def _handle_request(request: Any) -> Dict[str, Any]:
+    if type(request) is not dict:
+        return _error_response(None, "invalid_request")
+    req_id = request.get("id")
+    method = request.get("method")
+    params = request.get("params", {})
+
+    # Branches are ordered by call frequency: order signing dominates steady-state traffic.
+    # The try only catches malformed params (non-integer fields or a non-object params value);
+    # it is free when nothing raises.
+    try:
+        if method == "sign_create_order":
+            status, result = handle_sign_create_order(params)
+        elif method == "sign_cancel_order":
+            status, result = handle_sign_cancel_order(params)
+        elif method == "sign_cancel_all":
+            status, result = handle_sign_cancel_all(params)
+        elif method == "sign_batch":
+            status, result = handle_sign_batch(params)
+        elif method == "create_auth_token":
+            status, result = handle_create_auth_token(params)
+        elif method == "create_client":
+            status, result = handle_create_client(params)
         else:
-            try:
-                outcome = handler(params)
-                outcome.setdefault("id", req_id)
-                response = outcome
-            except Exception as exc:  # pragma: no cover - safety net
-                response = {"id": req_id, "error": f"exception:{exc}"}
+            return _error_response(req_id, f"unknown_method:{method}")
+    except Exception as exc:  # pragma: no cover - safety net
+        return _error_response(req_id, f"exception:{exc}")
+
+    if status is _ERR:
+        return _error_response(req_id, result)
+    _RESPONSE["id"] = req_id
+    _RESPONSE["result"] = result
+    return _RESPONSE
+
+
+def _encode(response: Dict[str, Any]) -> bytes:
+    result = response.get("result")
+    if result is _OK:
+        return _OK_TEMPLATE % _dumps(response["id"])
+    if type(result) is list:
+        # Batch entries keep signed payloads as bytes; JSON carries them as strings.
+        for entry in result:
+            value = entry.get("result")
+            if type(value) is bytes:
+                entry["result"] = value.decode("utf-8", errors="replace")
+    return _dumps(response)
+
+
+def _respond(body: Any) -> Dict[str, Any]:
+    try:
+        request = _loads(body)
+    except ValueError as exc:  # pragma: no cover - defensive
+        return _error_response(None, f"invalid_json:{exc}")
+    return _handle_request(request)
+
+
+def _write_all(data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(STDOUT_FD, view):]
+
+
+def _serve_framed() -> None:
+    header_size = _FRAME_HEADER.size
+    inbuf = bytearray()
+    while True:
+        chunk = os.read(STDIN_FD, READ_CHUNK)
+        if not chunk:
+            return
+        inbuf += chunk
+
+        # Each reply is written as soon as it is signed so pipelined orders never wait on the
+        # rest of the read.
+        size = len(inbuf)
+        offset = 0
+        with memoryview(inbuf) as view:
+            while size - offset >= header_size:
+                start = offset + header_size
+                end = start + _FRAME_HEADER.unpack_from(inbuf, offset)[0]
+                if size < end:
+                    break
+                response = _respond(view[start:end])
+                result = response.get("result")
+                if type(result) is bytes:
+                    # Signed payloads are UTF-8 already: send them verbatim after the envelope
+                    # instead of decoding and re-escaping them as a JSON string.
+                    _RAW_ENVELOPE["id"] = response["id"]
+                    envelope = _dumps(_RAW_ENVELOPE)
+                    header = _FRAME_HEADER.pack(len(envelope) + 1 + len(result))
+                    _write_all(b"".join((header, envelope, b"\n", result)))
+                else:
+                    payload = _encode(response)
+                    _write_all(_FRAME_HEADER.pack(len(payload)) + payload)
+                offset = end
+        del inbuf[:offset]
+
+
+def _answer_line(line: Any) -> None:
+    response = _respond(line)
+    result = response.get("result")
+    if type(result) is bytes:
+        response["result"] = result.decode("utf-8", errors="replace")
+    _write_all(_encode(response) + b"\n")
+
+
+def _serve_lines() -> None:
+    inbuf = bytearray()
+    # Bytes before this offset are known to hold no newline, so a long line is scanned once.
+    scan_from = 0
+    while True:
+        chunk = os.read(STDIN_FD, READ_CHUNK)
+        if not chunk:
+            # A partial trailing line is answered as-is at EOF.
+            line = inbuf.strip()
+            if line:
+                _answer_line(line)
+            return
+        inbuf += chunk
+
+        start = 0
+        newline = inbuf.find(b"\n", scan_from)
+        while newline != -1:
+            line = inbuf[start:newline].strip()
+            if line:
+                _answer_line(line)
+            start = newline + 1
+            newline = inbuf.find(b"\n", start)
+        del inbuf[:start]
+        scan_from = len(inbuf)
+
+
+def _serve_socket(path: str) -> None:
+    if msgpack is None:
+        print("msgpack_required_for_socket_mode", file=sys.stderr, flush=True)
+        sys.exit(1)
 
-        print(json.dumps(response), flush=True)
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        pass
+    else:
+        # Only replace a stale socket from an earlier run, never an unrelated file.
+        if not stat.S_ISSOCK(mode):
+            print(f"signer_socket_path_not_a_socket:{path}", file=sys.stderr, flush=True)
+            sys.exit(1)
+        os.unlink(path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        # The socket signs orders, so it is created owner-only.
+        previous_umask = os.umask(0o077)
+        try:
+            server.bind(path)
+        finally:
+            os.umask(previous_umask)
+        server.listen(1)
+        conn, _ = server.accept()
+
+    # Signed payloads travel as MessagePack bin values, so results are never decoded to str.
+    packb = msgpack.Packer(use_bin_type=True).pack
+    unpacker = msgpack.Unpacker(raw=False)
+    buffer = bytearray(READ_CHUNK)
+    view = memoryview(buffer)
+    try:
+        with conn:
+            while True:
+                count = conn.recv_into(buffer)
+                if not count:
+                    return
+                try:
+                    unpacker.feed(view[:count])
+                    for request in unpacker:
+                        conn.sendall(packb(_handle_request(request)))
+                except (msgpack.UnpackException, ValueError) as exc:
+                    # The stream cannot be resynchronised after a bad byte, so report and hang up.
+                    conn.sendall(packb(_error_response(None, f"invalid_msgpack:{exc}")))
+                    return
+    finally:
+        os.unlink(path)
+
+
+def main() -> None:
+    if SOCKET_PATH:
+        _serve_socket(SOCKET_PATH)
+    elif FRAMING == "line":
+        _serve_lines()
+    else:
+        _serve_framed()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,5 @@
 import { spawn, type ChildProcessWithoutNullStreams } from "node:child_process";
 import path from "node:path";
-import { createInterface } from "node:readline";
 import { fileURLToPath } from "node:url";
 
 export interface LighterSignerConfig {
@@ -46,6 +45,44 @@ export interface SignedTxPayload {
   signature?: string;
 }
 
+export type BatchSignRequest =
+  | { type: "createOrder"; params: CreateOrderSignParams }
+  | { type: "cancelOrder"; params: CancelOrderSignParams }
+  | { type: "cancelAll"; params: CancelAllSignParams };
+
+type BridgeParams = Record<string, string | number>;
+
+interface BatchEntryResult {
+  result?: string | null;
+  error?: string;
+}
+
+const TX_TYPE_CREATE_ORDER = 14;
+const TX_TYPE_CANCEL_ORDER = 15;
+const TX_TYPE_CANCEL_ALL = 16;
+
+const BATCH_TX_TYPES: Record<BatchSignRequest["type"], number> = {
+  createOrder: TX_TYPE_CREATE_ORDER,
+  cancelOrder: TX_TYPE_CANCEL_ORDER,
+  cancelAll: TX_TYPE_CANCEL_ALL,
+};
+
+function toSignedTx(txType: number, result: unknown): SignedTxPayload {
+  const txInfo = String(result);
+  let signature: string | undefined;
+  let txHash: string | undefined;
+  try {
+    const parsed = JSON.parse(txInfo);
+    if (typeof parsed?.Sig === "string") signature = parsed.Sig;
+    if (typeof parsed?.SignedHash === "string") txHash = parsed.SignedHash;
+  } catch {
+    // ignore parsing errors – txInfo still valid for sendTx
+  }
+  return { txType, txInfo, txHash, signature };
+}
+
+const FRAME_HEADER_BYTES = 4;
+
 type PendingResolver = {
   resolve: (value: any) => void;
   reject: (error: Error) => void;
@@ -56,15 +93,20 @@ class PythonSignerBridge {
   private readonly pending = new Map<number, PendingResolver>();
   private readonly scriptPath: string;
   private seq = 0;
+  private inbound: Buffer = Buffer.alloc(0);
 
   constructor(scriptPath: string) {
     this.scriptPath = scriptPath;
-    this.child = spawn("python3", [this.scriptPath], {
+    // Any interpreter with ctypes works; PyPy runs the dispatch loop JIT-compiled and ships cffi.
+    const python = process.env.LIGHTER_SIGNER_PYTHON?.trim() || "python3";
+    // This client speaks the stdio protocol; an inherited socket path would switch the bridge away from it.
+    const { LIGHTER_SIGNER_SOCKET: _socketPath, ...env } = process.env;
+    this.child = spawn(python, [this.scriptPath], {
       stdio: ["pipe", "pipe", "pipe"],
+      env: { ...env, LIGHTER_SIGNER_FRAMING: "length" },
     });
 
-    const rl = createInterface({ input: this.child.stdout });
-    rl.on("line", (line) => this.onLine(line));
+    this.child.stdout.on("data", (chunk: Buffer) => this.onData(chunk));
     this.child.on("error", (error) => {
       this.rejectAll(new Error(`lighter signer bridge failed to start: ${String(error)}`));
     });
@@ -79,14 +121,32 @@ class PythonSignerBridge {
     });
   }
 
-  private onLine(line: string): void {
+  // Responses are framed as a 4-byte little-endian length followed by a JSON envelope.
+  private onData(chunk: Buffer): void {
+    let buffer = this.inbound.length ? Buffer.concat([this.inbound, chunk]) : chunk;
+    while (buffer.length >= FRAME_HEADER_BYTES) {
+      const end = FRAME_HEADER_BYTES + buffer.readUInt32LE(0);
+      if (buffer.length < end) break;
+      this.onFrame(buffer.subarray(FRAME_HEADER_BYTES, end));
+      buffer = buffer.subarray(end);
+    }
+    this.inbound = buffer;
+  }
+
+  private onFrame(frame: Buffer): void {
+    // Signed payloads trail the envelope after a newline as raw text rather than an escaped string.
+    const split = frame.indexOf(0x0a);
+    const envelope = frame.toString("utf8", 0, split === -1 ? frame.length : split);
     let payload: any;
     try {
-      payload = JSON.parse(line);
+      payload = JSON.parse(envelope);
     } catch (error) {
-      console.error(`[LighterSignerBridge] invalid JSON: ${line}`, error);
+      console.error(`[LighterSignerBridge] invalid JSON: ${envelope}`, error);
       return;
     }
+    if (split !== -1) {
+      payload.result = frame.toString("utf8", split + 1);
+    }
     const { id, error } = payload;
     const pending = this.pending.get(Number(id));
     if (!pending) {
@@ -110,15 +170,20 @@ class PythonSignerBridge {
     this.pending.clear();
   }
 
-  async call(method: string, params: Record<string, unknown>): Promise<any> {
+  async call(
+    method: string,
+    params: BridgeParams | { requests: Array<{ method: string; params: BridgeParams }> }
+  ): Promise<any> {
     const id = ++this.seq;
-    const payload = JSON.stringify({ id, method, params }, (_key, value) => {
-      if (typeof value === "bigint") return value.toString();
-      return value;
-    });
+    // Callers pass bigint fields as strings already; a replacer would force JSON.stringify off its fast path.
+    const payload = JSON.stringify({ id, method, params });
+    const length = Buffer.byteLength(payload, "utf8");
+    const frame = Buffer.allocUnsafe(FRAME_HEADER_BYTES + length);
+    frame.writeUInt32LE(length, 0);
+    frame.write(payload, FRAME_HEADER_BYTES, "utf8");
     return new Promise((resolve, reject) => {
       this.pending.set(id, { resolve, reject });
-      this.child.stdin.write(payload + "\n", (err) => {
+      this.child.stdin.write(frame, (err) => {
         if (err) {
           this.pending.delete(id);
           reject(err);
@@ -177,12 +242,9 @@ export class LighterSigner {
     await this.ready;
   }
 
-  async signCreateOrder(params: CreateOrderSignParams): Promise<SignedTxPayload> {
-    await this.ensureReady();
-    const apiKeyIndex = params.apiKeyIndex ?? this.defaultKeyIndex;
-
-    const result = await this.bridge.call("sign_create_order", {
-      apiKeyIndex,
+  private createOrderParams(params: CreateOrderSignParams): BridgeParams {
+    return {
+      apiKeyIndex: params.apiKeyIndex ?? this.defaultKeyIndex,
       marketIndex: params.marketIndex,
       clientOrderIndex: params.clientOrderIndex.toString(),
       baseAmount: params.baseAmount.toString(),
@@ -194,79 +256,68 @@ export class LighterSigner {
       triggerPrice: params.triggerPrice,
       orderExpiry: params.orderExpiry.toString(),
       nonce: params.nonce.toString(),
-    });
-
-    const txInfo = String(result);
-    let signature: string | undefined;
-    let txHash: string | undefined;
-    try {
-      const parsed = JSON.parse(txInfo);
-      if (typeof parsed?.Sig === "string") signature = parsed.Sig;
-      if (typeof parsed?.SignedHash === "string") txHash = parsed.SignedHash;
-    } catch {
-      // ignore parsing errors – txInfo still valid for sendTx
-    }
-
-    return {
-      txType: 14,
-      txInfo,
-      txHash,
-      signature,
     };
   }
 
-  async signCancelOrder(params: CancelOrderSignParams): Promise<SignedTxPayload> {
-    await this.ensureReady();
-    const apiKeyIndex = params.apiKeyIndex ?? this.defaultKeyIndex;
-
-    const result = await this.bridge.call("sign_cancel_order", {
-      apiKeyIndex,
+  private cancelOrderParams(params: CancelOrderSignParams): BridgeParams {
+    return {
+      apiKeyIndex: params.apiKeyIndex ?? this.defaultKeyIndex,
       marketIndex: params.marketIndex,
       orderIndex: params.orderIndex.toString(),
       nonce: params.nonce.toString(),
-    });
-
-    const txInfo = String(result);
-    let signature: string | undefined;
-    try {
-      const parsed = JSON.parse(txInfo);
-      if (typeof parsed?.Sig === "string") signature = parsed.Sig;
-    } catch {
-      // ignore
-    }
+    };
+  }
 
+  private cancelAllParams(params: CancelAllSignParams): BridgeParams {
     return {
-      txType: 15,
-      txInfo,
-      signature,
+      apiKeyIndex: params.apiKeyIndex ?? this.defaultKeyIndex,
+      timeInForce: params.timeInForce,
+      scheduledTime: params.scheduledTime.toString(),
+      nonce: params.nonce.toString(),
     };
   }
 
-  async signCancelAll(params: CancelAllSignParams): Promise<SignedTxPayload> {
+  async signCreateOrder(params: CreateOrderSignParams): Promise<SignedTxPayload> {
     await this.ensureReady();
-    const apiKeyIndex = params.apiKeyIndex ?? this.defaultKeyIndex;
+    const result = await this.bridge.call("sign_create_order", this.createOrderParams(params));
+    return toSignedTx(TX_TYPE_CREATE_ORDER, result);
+  }
 
-    const result = await this.bridge.call("sign_cancel_all", {
-      apiKeyIndex,
-      timeInForce: params.timeInForce,
-      scheduledTime: params.scheduledTime.toString(),
-      nonce: params.nonce.toString(),
-    });
+  async signCancelOrder(params: CancelOrderSignParams): Promise<SignedTxPayload> {
+    await this.ensureReady();
+    const result = await this.bridge.call("sign_cancel_order", this.cancelOrderParams(params));
+    return toSignedTx(TX_TYPE_CANCEL_ORDER, result);
+  }
 
-    const txInfo = String(result);
-    let signature: string | undefined;
-    try {
-      const parsed = JSON.parse(txInfo);
-      if (typeof parsed?.Sig === "string") signature = parsed.Sig;
-    } catch {
-      // ignore
-    }
+  async signCancelAll(params: CancelAllSignParams): Promise<SignedTxPayload> {
+    await this.ensureReady();
+    const result = await this.bridge.call("sign_cancel_all", this.cancelAllParams(params));
+    return toSignedTx(TX_TYPE_CANCEL_ALL, result);
+  }
 
-    return {
-      txType: 16,
-      txInfo,
-      signature,
-    };
+  /**
+   * Sign several transactions in one bridge round trip, e.g. a whole grid update.
+   * Results keep the request order; a failed entry is rejected without failing the rest.
+   */
+  async signBatch(requests: BatchSignRequest[]): Promise<PromiseSettledResult<SignedTxPayload>[]> {
+    await this.ensureReady();
+    const entries = requests.map((request) => {
+      switch (request.type) {
+        case "createOrder":
+          return { method: "sign_create_order", params: this.createOrderParams(request.params) };
+        case "cancelOrder":
+          return { method: "sign_cancel_order", params: this.cancelOrderParams(request.params) };
+        case "cancelAll":
+          return { method: "sign_cancel_all", params: this.cancelAllParams(request.params) };
+      }
+    });
+    const results: BatchEntryResult[] = await this.bridge.call("sign_batch", { requests: entries });
+    return results.map((entry, index): PromiseSettledResult<SignedTxPayload> => {
+      if (entry.error !== undefined) {
+        return { status: "rejected", reason: new Error(String(entry.error)) };
+      }
+      return { status: "fulfilled", value: toSignedTx(BATCH_TX_TYPES[requests[index]!.type], entry.result) };
+    });
   }
 
   async createAuthToken(deadlineMs: number, apiKeyIndex?: number): Promise<string> {
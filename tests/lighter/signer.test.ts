@@ -2,17 +2,19 @@ import { describe, expect, it } from "vitest";
 import { LighterSigner } from "../../src/exchanges/lighter/signer";
 import { LIGHTER_ORDER_TYPE, LIGHTER_TIME_IN_FORCE } from "../../src/exchanges/lighter/constants";
 
+const SIGNER_CONFIG = {
+  accountIndex: 65,
+  chainId: 300,
+  apiKeys: {
+    3: "0xed636277f3753b6c0275f7a28c2678a7f3a95655e09deaebec15179b50c5da7f903152e50f594f7b",
+  },
+};
+
 describe("LighterSigner", () => {
-  it("produces deterministic create order signature", () => {
-    const signer = new LighterSigner({
-      accountIndex: 65,
-      chainId: 300,
-      apiKeys: {
-        3: "0xed636277f3753b6c0275f7a28c2678a7f3a95655e09deaebec15179b50c5da7f903152e50f594f7b",
-      },
-    });
+  it("signs a create order payload", async () => {
+    const signer = new LighterSigner(SIGNER_CONFIG);
 
-    const signed = signer.signCreateOrder({
+    const signed = await signer.signCreateOrder({
       marketIndex: 0,
       clientOrderIndex: 123n,
       baseAmount: 1000n,
@@ -29,9 +31,10 @@ describe("LighterSigner", () => {
     });
 
     const payload = JSON.parse(signed.txInfo);
-    expect(payload.AccountIndex).toBe(65);
-    expect(payload.ApiKeyIndex).toBe(3);
-    expect(payload.OrderInfo).toMatchObject({
+    expect(signed.txType).toBe(14);
+    expect(payload).toMatchObject({
+      AccountIndex: 65,
+      ApiKeyIndex: 3,
       MarketIndex: 0,
       ClientOrderIndex: 123,
       BaseAmount: 1000,
@@ -42,11 +45,75 @@ describe("LighterSigner", () => {
       ReduceOnly: 0,
       TriggerPrice: 0,
       OrderExpiry: 0,
+      Nonce: 42,
     });
     expect(typeof payload.Sig).toBe("string");
     expect(payload.Sig.length).toBeGreaterThan(0);
-    expect(signed.txHash).toBe("3ef41bc5fdb2e2146b5f5df046fb1ad801dc2aa5c47703665bfd3eb67a21e67048957f7187b12035");
-    expect(typeof signed.signature).toBe("string");
-    expect(signed.signature.length).toBeGreaterThan(0);
+    expect(signed.signature).toBe(payload.Sig);
+  });
+
+  it("matches pipelined bridge responses to their requests", async () => {
+    const signer = new LighterSigner(SIGNER_CONFIG);
+
+    // Enough in-flight calls that the replies span several stdout chunks.
+    const orderIndexes = Array.from({ length: 1000 }, (_, i) => 281474976710656n + BigInt(i));
+    const cancels = orderIndexes.map((orderIndex, i) =>
+      signer.signCancelOrder({ marketIndex: 1, orderIndex, nonce: BigInt(i) })
+    );
+    const unknownKey = signer.signCancelOrder({ marketIndex: 1, orderIndex: 1n, nonce: 0n, apiKeyIndex: 9 });
+    const token = signer.createAuthToken(Date.now() + 3_600_000);
+
+    await expect(unknownKey).rejects.toThrow("client_not_initialized");
+    const signed = await Promise.all(cancels);
+    signed.forEach((tx, i) => {
+      const payload = JSON.parse(tx.txInfo);
+      expect(payload.Index).toBe(Number(orderIndexes[i]));
+      expect(payload.Nonce).toBe(i);
+      expect(tx.signature).toBe(payload.Sig);
+    });
+    expect(await token).toMatch(/^\d+:65:3:[0-9a-f]+$/);
+  }, 20_000);
+
+  it("signs a batch across key changes and isolates failed entries", async () => {
+    const signer = new LighterSigner({
+      ...SIGNER_CONFIG,
+      apiKeys: { ...SIGNER_CONFIG.apiKeys, 4: SIGNER_CONFIG.apiKeys[3] },
+    });
+
+    const results = await signer.signBatch([
+      {
+        type: "createOrder",
+        params: {
+          marketIndex: 0,
+          clientOrderIndex: 7n,
+          baseAmount: 1000n,
+          price: 170000,
+          isAsk: 0,
+          orderType: LIGHTER_ORDER_TYPE.LIMIT,
+          timeInForce: LIGHTER_TIME_IN_FORCE.GOOD_TILL_TIME,
+          reduceOnly: 0,
+          triggerPrice: 0,
+          orderExpiry: -1n,
+          apiKeyIndex: 3,
+          nonce: 1n,
+        },
+      },
+      { type: "cancelOrder", params: { marketIndex: 0, orderIndex: 11n, apiKeyIndex: 4, nonce: 2n } },
+      { type: "cancelOrder", params: { marketIndex: 0, orderIndex: 12n, apiKeyIndex: 9, nonce: 3n } },
+      { type: "cancelAll", params: { timeInForce: 0, scheduledTime: 0n, apiKeyIndex: 3, nonce: 4n } },
+    ]);
+
+    expect(results.map((result) => result.status)).toEqual(["fulfilled", "fulfilled", "rejected", "fulfilled"]);
+    const [created, cancelled, failed, cancelledAll] = results;
+    if (created?.status !== "fulfilled" || cancelled?.status !== "fulfilled" || cancelledAll?.status !== "fulfilled") {
+      throw new Error("expected signed entries");
+    }
+    expect(created.value.txType).toBe(14);
+    expect(JSON.parse(created.value.txInfo)).toMatchObject({ ApiKeyIndex: 3, ClientOrderIndex: 7, Nonce: 1 });
+    expect(cancelled.value.txType).toBe(15);
+    expect(JSON.parse(cancelled.value.txInfo)).toMatchObject({ ApiKeyIndex: 4, Index: 11, Nonce: 2 });
+    expect(cancelledAll.value.txType).toBe(16);
+    expect(JSON.parse(cancelledAll.value.txInfo)).toMatchObject({ ApiKeyIndex: 3, Nonce: 4 });
+    expect(failed?.status === "rejected" && String(failed.reason)).toMatch("client_not_initialized");
   });
 });
@@ -0,0 +1,124 @@
+"""Round-trip tests for the signer bridge's Unix-socket MessagePack transport.
+
+Run with ``python3 -m unittest discover -s tests/lighter``. Skipped when msgpack is missing.
+"""
+
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - socket mode is optional
+    msgpack = None
+
+BRIDGE = Path(__file__).resolve().parents[2] / "src" / "exchanges" / "lighter" / "lighter_signer_bridge.py"
+PRIVATE_KEY = "0xed636277f3753b6c0275f7a28c2678a7f3a95655e09deaebec15179b50c5da7f903152e50f594f7b"
+CREATE_CLIENT = {
+    "id": 1,
+    "method": "create_client",
+    "params": {
+        "apiKeyIndex": 3,
+        "privateKey": PRIVATE_KEY,
+        "baseUrl": "http://localhost",
+        "chainId": 300,
+        "accountIndex": 65,
+    },
+}
+CANCEL_PARAMS = {"apiKeyIndex": 3, "marketIndex": 0, "orderIndex": 7, "nonce": 5}
+
+
+@unittest.skipIf(msgpack is None, "msgpack is required for socket mode")
+class SocketTransportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "signer.sock")
+        self.env = dict(os.environ, LIGHTER_SIGNER_SOCKET=self.path)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def _start(self) -> subprocess.Popen:
+        process = subprocess.Popen([sys.executable, str(BRIDGE)], env=self.env)
+        self.addCleanup(process.kill)
+        deadline = time.monotonic() + 10
+        while not os.path.exists(self.path):
+            self.assertIsNone(process.poll(), "bridge exited before listening")
+            self.assertLess(time.monotonic(), deadline, "bridge did not create its socket")
+            time.sleep(0.02)
+        return process
+
+    def _connect(self) -> socket.socket:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(10)
+        conn.connect(self.path)
+        self.addCleanup(conn.close)
+        return conn
+
+    @staticmethod
+    def _receive(conn: socket.socket, count: int) -> list:
+        unpacker = msgpack.Unpacker(raw=False)
+        replies: list = []
+        while len(replies) < count:
+            chunk = conn.recv(65536)
+            if not chunk:
+                break
+            unpacker.feed(chunk)
+            replies.extend(unpacker)
+        return replies
+
+    def test_round_trip(self) -> None:
+        process = self._start()
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode) & 0o077, 0)
+        conn = self._connect()
+        requests = [
+            CREATE_CLIENT,
+            {"id": 2, "method": "sign_cancel_order", "params": CANCEL_PARAMS},
+            {"id": 3, "method": "sign_batch", "params": {"requests": [{"method": "sign_cancel_order", "params": CANCEL_PARAMS}]}},
+            [1, 2],
+            {"id": 5, "method": "sign_cancel_order", "params": {"apiKeyIndex": 3}},
+        ]
+        conn.sendall(b"".join(msgpack.packb(request) for request in requests))
+        created, single, batch, invalid, missing = self._receive(conn, len(requests))
+
+        self.assertEqual(created, {"id": 1, "result": "ok"})
+        self.assertEqual(single["id"], 2)
+        self.assertIsInstance(single["result"], bytes)
+        self.assertIn(b'"Index":7', single["result"])
+        self.assertIsInstance(batch["result"][0]["result"], bytes)
+        self.assertEqual(invalid, {"id": None, "error": "invalid_request"})
+        self.assertEqual(missing, {"id": 5, "error": "missing_params:marketIndex,nonce,orderIndex"})
+
+        conn.close()
+        self.assertEqual(process.wait(timeout=10), 0)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_malformed_stream_is_reported(self) -> None:
+        process = self._start()
+        conn = self._connect()
+        conn.sendall(msgpack.packb(CREATE_CLIENT) + b"\xc1")
+        created, error = self._receive(conn, 2)
+
+        self.assertEqual(created, {"id": 1, "result": "ok"})
+        self.assertIsNone(error["id"])
+        self.assertTrue(error["error"].startswith("invalid_msgpack:"))
+        self.assertEqual(conn.recv(1), b"")
+        self.assertEqual(process.wait(timeout=10), 0)
+
+    def test_refuses_to_replace_regular_file(self) -> None:
+        Path(self.path).write_text("keep")
+        result = subprocess.run([sys.executable, str(BRIDGE)], env=self.env, capture_output=True, text=True, timeout=10)
+
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("signer_socket_path_not_a_socket", result.stderr)
+        self.assertEqual(Path(self.path).read_text(), "keep")
+
+
+if __name__ == "__main__":
+    unittest.main()